@@ -7,5 +7,5 @@ setup(
     package_dir={"": "src"},
     python_requires=">=3.9",
     install_requires=[],
-    extras_require={"dev": ["pytest>=7"]},
+    extras_require={"dev": ["pytest>=7"], "fast": ["pyahocorasick>=2.0"]},
 )
@@ -4,16 +4,30 @@ SLA tracking, auto-priority, queue management, weekly reports.
 """
 from __future__ import annotations
 
+import re
 import sqlite3
-from collections import defaultdict
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import uuid
 
+try:  # optional: pip install pyahocorasick
+    import ahocorasick
+except ImportError:  # pragma: no cover - exercised when extra is absent
+    ahocorasick = None
+
 
 # ─────────────────────────── data models ────────────────────────────────────
 
+def _new_id() -> str:
+    """Random 32-char hex id (uuid4 without the dash formatting)."""
+    return uuid.uuid4().hex
+
+
+# __slots__ dataclasses need Python 3.10+
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 PRIORITY_LABELS = {1: "critical", 2: "high", 3: "medium", 4: "low"}
 STATUS_FLOW = {
     "open":        ["in_progress", "on_hold", "cancelled"],
@@ -25,6 +39,33 @@ STATUS_FLOW = {
     "cancelled":   [],
 }
 
+# target status → statuses it may be entered from
+REVERSE_FLOW: Dict[str, Tuple[str, ...]] = {
+    target: tuple(src for src, nexts in STATUS_FLOW.items() if target in nexts)
+    for target in STATUS_FLOW
+}
+
+# Statuses with no further SLA clock (terminal) and those that count as
+# resolved (done).  The ordered tuples are the single source: the frozensets
+# serve Python membership tests and the *_SQL lists are rendered from the
+# same order, so SQL text (incl. the idx_tickets_open partial-index filter,
+# which the planner matches structurally) is stable across runs.
+_TERMINAL_STATUSES = ("resolved", "closed", "cancelled")
+_DONE_STATUSES = ("resolved", "closed")
+_TERMINAL = frozenset(_TERMINAL_STATUSES)
+_DONE = frozenset(_DONE_STATUSES)
+_TERMINAL_SQL = "(" + ",".join(f"'{s}'" for s in _TERMINAL_STATUSES) + ")"
+_DONE_SQL = "(" + ",".join(f"'{s}'" for s in _DONE_STATUSES) + ")"
+_OPEN_STATUS_SQL = f"status NOT IN {_TERMINAL_SQL}"
+
+# SQL twin of Ticket.is_breached evaluated against a tickets row; binds one
+# parameter, *now* in epoch seconds.  Keep the two definitions in step.
+_BREACHED_SQL = (
+    f"(CASE WHEN status IN {_TERMINAL_SQL} "
+    "THEN COALESCE(resolved_at, updated_at) ELSE ? END "
+    "> created_at + sla_hours * 3600)"
+)
+
 DEFAULT_SLA: Dict[int, int] = {
     1: 4,    # critical → 4 hours
     2: 24,   # high     → 24 hours
@@ -40,12 +81,64 @@ PRIORITY_KEYWORDS: Dict[int, List[str]] = {
 }
 
 
-@dataclass
+def _build_keyword_automaton():
+    """Aho-Corasick automaton over all keywords, valued by priority."""
+    automaton = ahocorasick.Automaton()
+    for priority, keywords in PRIORITY_KEYWORDS.items():
+        for kw in keywords:
+            # keep the most urgent priority if a keyword is listed twice
+            if kw not in automaton or automaton.get(kw) > priority:
+                automaton.add_word(kw, priority)
+    automaton.make_automaton()
+    return automaton
+
+
+# Capture-group number → priority for _KEYWORD_RE (slot 0 unused).
+_KEYWORD_GROUP_PRIORITY: Tuple[int, ...] = (0, *sorted(PRIORITY_KEYWORDS))
+
+
+def _build_keyword_regex() -> "re.Pattern[str]":
+    """
+    One capture group per priority wrapped in a lookahead so every start
+    position is tried (overlapping matches are not skipped).  Groups are
+    numbered in priority order; see _KEYWORD_GROUP_PRIORITY.
+    """
+    groups = "|".join(
+        "(" + "|".join(map(re.escape, PRIORITY_KEYWORDS[p])) + ")"
+        for p in _KEYWORD_GROUP_PRIORITY[1:]
+    )
+    return re.compile(f"(?=(?:{groups}))")
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton() if ahocorasick else None
+_KEYWORD_RE = _build_keyword_regex()
+
+
+def _keyword_priority(text: str) -> Optional[int]:
+    """Most urgent priority whose keyword occurs in *text*, in one pass."""
+    best: Optional[int] = None
+    if _KEYWORD_AUTOMATON is not None:
+        for _, priority in _KEYWORD_AUTOMATON.iter(text):
+            if best is None or priority < best:
+                best = priority
+                if best == 1:
+                    break
+        return best
+    for m in _KEYWORD_RE.finditer(text):
+        priority = _KEYWORD_GROUP_PRIORITY[m.lastindex]
+        if best is None or priority < best:
+            best = priority
+            if best == 1:
+                break
+    return best
+
+
+@dataclass(**_SLOTS)
 class Ticket:
     title: str
     description: str
     requester: str
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     priority: int = 3                # 1=critical … 4=low
     status: str = "open"
     assignee: Optional[str] = None
@@ -58,32 +151,56 @@ class Ticket:
     def sla_deadline(self) -> datetime:
         return self.created_at + timedelta(hours=self.sla_hours)
 
-    def is_breached(self) -> bool:
-        if self.status in ("resolved", "closed", "cancelled"):
+    # Each check accepts an optional *now* so callers evaluating several
+    # of them (or many tickets) can share one utcnow() reading.
+
+    def is_breached(self, now: Optional[datetime] = None) -> bool:
+        # Mirrored in SQL by _BREACHED_SQL (used by update_status); change
+        # both together.
+        if self.status in _TERMINAL:
             ref = self.resolved_at or self.updated_at
             return ref > self.sla_deadline()
-        return datetime.utcnow() > self.sla_deadline()
+        if now is None:
+            now = datetime.utcnow()
+        return now > self.sla_deadline()
 
-    def time_to_sla(self) -> timedelta:
+    def time_to_sla(self, now: Optional[datetime] = None) -> timedelta:
         """Positive = time left; negative = overdue."""
-        return self.sla_deadline() - datetime.utcnow()
+        if now is None:
+            now = datetime.utcnow()
+        return self.sla_deadline() - now
 
-    def age_hours(self) -> float:
-        return (datetime.utcnow() - self.created_at).total_seconds() / 3600
+    def age_hours(self, now: Optional[datetime] = None) -> float:
+        if now is None:
+            now = datetime.utcnow()
+        return (now - self.created_at).total_seconds() / 3600
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Comment:
     ticket_id: str
     author: str
     body: str
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     created_at: datetime = field(default_factory=datetime.utcnow)
     is_internal: bool = False
 
 
 # ──────────────────────────── database layer ────────────────────────────────
 
+# Timestamps are stored as INTEGER unix-epoch seconds (UTC).
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_epoch(dt: datetime) -> int:
+    """Naive-UTC datetime → epoch seconds (``dt.timestamp()`` assumes local)."""
+    return int((dt - _EPOCH).total_seconds())
+
+
+def _from_epoch(ts: int) -> datetime:
+    return _EPOCH + timedelta(seconds=ts)
+
+
 DDL = """
 CREATE TABLE IF NOT EXISTS tickets (
     id          TEXT PRIMARY KEY,
@@ -94,10 +211,15 @@ CREATE TABLE IF NOT EXISTS tickets (
     status      TEXT NOT NULL DEFAULT 'open',
     assignee    TEXT,
     sla_hours   INTEGER NOT NULL DEFAULT 72,
-    tags        TEXT DEFAULT '',
-    created_at  TEXT NOT NULL,
-    updated_at  TEXT NOT NULL,
-    resolved_at TEXT
+    created_at  INTEGER NOT NULL,
+    updated_at  INTEGER NOT NULL,
+    resolved_at INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS ticket_tags (
+    ticket_id   TEXT NOT NULL REFERENCES tickets(id),
+    tag         TEXT NOT NULL,
+    PRIMARY KEY (ticket_id, tag)
 );
 
 CREATE TABLE IF NOT EXISTS comments (
@@ -106,24 +228,138 @@ CREATE TABLE IF NOT EXISTS comments (
     author      TEXT NOT NULL,
     body        TEXT NOT NULL,
     is_internal INTEGER NOT NULL DEFAULT 0,
-    created_at  TEXT NOT NULL
+    created_at  INTEGER NOT NULL
 );
 
 CREATE TABLE IF NOT EXISTS sla_history (
     id          TEXT PRIMARY KEY,
     ticket_id   TEXT NOT NULL REFERENCES tickets(id),
     event       TEXT NOT NULL,
-    occurred_at TEXT NOT NULL,
+    occurred_at INTEGER NOT NULL,
     sla_hours   INTEGER,
     was_breached INTEGER NOT NULL DEFAULT 0
 );
 
-CREATE INDEX IF NOT EXISTS idx_tickets_status   ON tickets(status);
-CREATE INDEX IF NOT EXISTS idx_tickets_assignee ON tickets(assignee);
-CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets(priority);
+-- get_queue orders by (priority, created_at); these let it walk an index
+-- instead of sorting.  They supersede the single-column status/priority/
+-- assignee indexes, which are dropped on databases created before they
+-- existed.
+DROP INDEX IF EXISTS idx_tickets_status;
+DROP INDEX IF EXISTS idx_tickets_open_created;
+DROP INDEX IF EXISTS idx_tickets_priority;
+DROP INDEX IF EXISTS idx_tickets_assignee;
+CREATE INDEX IF NOT EXISTS idx_tickets_status_prio_created
+    ON tickets(status, priority, created_at);
+CREATE INDEX IF NOT EXISTS idx_tickets_prio_created
+    ON tickets(priority, created_at);
+CREATE INDEX IF NOT EXISTS idx_tickets_assignee_prio_created
+    ON tickets(assignee, priority, created_at);
+CREATE INDEX IF NOT EXISTS idx_tickets_open
+    ON tickets(priority, created_at)
+    WHERE """ + _OPEN_STATUS_SQL + """;
 CREATE INDEX IF NOT EXISTS idx_comments_ticket  ON comments(ticket_id);
+CREATE INDEX IF NOT EXISTS idx_tag_lookup       ON ticket_tags(tag, ticket_id);
+"""
+
+# Full-text index over ticket title/description, kept in sync by triggers.
+# Applied separately because not every SQLite build ships FTS5.
+FTS_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts USING fts5(
+    title, description, content='tickets', content_rowid='rowid'
+);
+
+CREATE TRIGGER IF NOT EXISTS tickets_fts_ai AFTER INSERT ON tickets BEGIN
+    INSERT INTO tickets_fts(rowid, title, description)
+    VALUES (new.rowid, new.title, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tickets_fts_ad AFTER DELETE ON tickets BEGIN
+    INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tickets_fts_au
+AFTER UPDATE OF title, description ON tickets BEGIN
+    INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO tickets_fts(rowid, title, description)
+    VALUES (new.rowid, new.title, new.description);
+END;
+"""
+
+
+# Copies comma-joined tags from a legacy tickets.tags column into ticket_tags.
+_SPLIT_TAGS_SQL = """
+WITH RECURSIVE split(ticket_id, tag, rest) AS (
+    SELECT id, '', tags || ',' FROM {source} WHERE COALESCE(tags, '') <> ''
+    UNION ALL
+    SELECT ticket_id, substr(rest, 1, instr(rest, ',') - 1),
+           substr(rest, instr(rest, ',') + 1)
+    FROM split WHERE rest <> ''
+)
+INSERT OR IGNORE INTO ticket_tags (ticket_id, tag)
+SELECT ticket_id, tag FROM split WHERE tag <> '';
 """
 
+# Bumped whenever the on-disk layout changes; stored in PRAGMA user_version.
+SCHEMA_VERSION = 1
+
+# v0 → v1: ISO-8601 TEXT timestamps become INTEGER epoch seconds and the
+# comma-joined tickets.tags column is split into ticket_tags.  SQLite
+# keeps the declared column affinity, so the tables are rebuilt (old ones
+# renamed aside, DDL recreates them, rows are copied over) rather than
+# updated in place.  rowids are preserved.  Indexes are dropped by name
+# first: they follow a renamed table and would block CREATE INDEX IF NOT
+# EXISTS in DDL.
+_MIGRATE_V0_SQL = """
+BEGIN;
+DROP INDEX IF EXISTS idx_tickets_status;
+DROP INDEX IF EXISTS idx_tickets_assignee;
+DROP INDEX IF EXISTS idx_tickets_priority;
+DROP INDEX IF EXISTS idx_comments_ticket;
+ALTER TABLE tickets     RENAME TO _v0_tickets;
+ALTER TABLE comments    RENAME TO _v0_comments;
+ALTER TABLE sla_history RENAME TO _v0_sla_history;
+""" + DDL + """
+INSERT INTO tickets (rowid, id, title, description, requester, priority,
+                     status, assignee, sla_hours,
+                     created_at, updated_at, resolved_at)
+SELECT rowid, id, title, description, requester, priority,
+       status, assignee, sla_hours,
+       CAST(strftime('%s', created_at)  AS INTEGER),
+       CAST(strftime('%s', updated_at)  AS INTEGER),
+       CAST(strftime('%s', resolved_at) AS INTEGER)
+FROM _v0_tickets;
+
+""" + _SPLIT_TAGS_SQL.format(source="_v0_tickets") + """
+INSERT INTO comments (rowid, id, ticket_id, author, body, is_internal, created_at)
+SELECT rowid, id, ticket_id, author, body, is_internal,
+       CAST(strftime('%s', created_at) AS INTEGER)
+FROM _v0_comments;
+
+INSERT INTO sla_history (rowid, id, ticket_id, event, occurred_at,
+                         sla_hours, was_breached)
+SELECT rowid, id, ticket_id, event,
+       CAST(strftime('%s', occurred_at) AS INTEGER), sla_hours, was_breached
+FROM _v0_sla_history;
+
+DROP TABLE _v0_tickets;
+DROP TABLE _v0_comments;
+DROP TABLE _v0_sla_history;
+COMMIT;
+"""
+
+
+# Fixed column order consumed by TicketSystem._row_to_ticket.
+TICKET_COLUMNS = (
+    "id, title, description, requester, priority, status, assignee, "
+    "sla_hours, created_at, updated_at, resolved_at"
+)
+
+# Tags are bound as IN (...) parameters in chunks below SQLite's
+# historical 999-variable limit.
+_TAG_FETCH_CHUNK = 500
+
 
 class TicketSystem:
     """
@@ -132,81 +368,215 @@ class TicketSystem:
     assignment workflow, and weekly report generation.
     """
 
+    # Hot-path statements built once so every call reuses the same SQL text
+    # and hits the connection's prepared-statement cache.
+    _SQL_INSERT_TICKET = (
+        "INSERT INTO tickets (id, title, description, requester, priority, "
+        "status, assignee, sla_hours, created_at, updated_at, resolved_at) "
+        "VALUES (:id, :title, :description, :requester, :priority, :status, "
+        ":assignee, :sla_hours, :created_at, :updated_at, :resolved_at)"
+    )
+    _SQL_INSERT_TAG = "INSERT OR IGNORE INTO ticket_tags VALUES (?,?)"
+    _SQL_GET_TICKET = f"SELECT {TICKET_COLUMNS} FROM tickets WHERE id=?"
+    _SQL_INSERT_SLA_EVENT = "INSERT INTO sla_history VALUES (?,?,?,?,?,?)"
+    _SQL_INSERT_COMMENT = "INSERT INTO comments VALUES (?,?,?,?,?,?)"
+    _SQL_TOUCH_TICKET = "UPDATE tickets SET updated_at=? WHERE id=?"
+
     def __init__(self, db_path: str = ":memory:"):
-        self.conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+        self.conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES,
+                                    cached_statements=256)
         self.conn.row_factory = sqlite3.Row
+        # WAL + NORMAL sync: one fsync per checkpoint rather than per commit
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-20000")   # ~20 MB page cache
+        self._migrate()
         self.conn.executescript(DDL)
+        self.has_fts = self._init_fts()
+        self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
         self.conn.commit()
 
+    def _migrate(self) -> None:
+        """Upgrade a database written by an older schema version in place."""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Database schema v{version} is newer than supported "
+                f"v{SCHEMA_VERSION}"
+            )
+        if version:
+            return
+        cols = {r["name"]: r["type"].upper()
+                for r in self.conn.execute("PRAGMA table_info(tickets)")}
+        if cols.get("created_at") == "TEXT":
+            script = _MIGRATE_V0_SQL
+        elif "tags" in cols:
+            # epoch timestamps already, but tags still in the CSV column
+            script = ("BEGIN;" + DDL
+                      + _SPLIT_TAGS_SQL.format(source="tickets") + "COMMIT;")
+        else:
+            return
+        try:
+            self.conn.executescript(script)
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+
+    def _init_fts(self) -> bool:
+        """Create the FTS5 index if supported; backfill it on first creation."""
+        existed = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name='tickets_fts'"
+        ).fetchone()
+        try:
+            self.conn.executescript(FTS_DDL)
+        except sqlite3.OperationalError:   # SQLite built without FTS5
+            return False
+        if not existed:
+            self.conn.execute(
+                "INSERT INTO tickets_fts(tickets_fts) VALUES ('rebuild')"
+            )
+        return True
+
     # ── ticket CRUD ──────────────────────────────────────────────────────────
 
+    @staticmethod
+    def _ticket_row(ticket: Ticket) -> Dict[str, Any]:
+        """Named parameters for _SQL_INSERT_TICKET."""
+        resolved_at = ticket.resolved_at
+        return {
+            "id": ticket.id, "title": ticket.title,
+            "description": ticket.description, "requester": ticket.requester,
+            "priority": ticket.priority, "status": ticket.status,
+            "assignee": ticket.assignee, "sla_hours": ticket.sla_hours,
+            "created_at": _to_epoch(ticket.created_at),
+            "updated_at": _to_epoch(ticket.updated_at),
+            "resolved_at": _to_epoch(resolved_at) if resolved_at else None,
+        }
+
     def create_ticket(self, ticket: Ticket) -> Ticket:
-        self.conn.execute(
-            "INSERT INTO tickets VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
-            (ticket.id, ticket.title, ticket.description, ticket.requester,
-             ticket.priority, ticket.status, ticket.assignee, ticket.sla_hours,
-             ",".join(ticket.tags),
-             ticket.created_at.isoformat(), ticket.updated_at.isoformat(),
-             ticket.resolved_at.isoformat() if ticket.resolved_at else None),
-        )
-        self._log_sla_event(ticket.id, "created", ticket.sla_hours)
-        self.conn.commit()
+        with self.conn:
+            self.conn.execute(self._SQL_INSERT_TICKET, self._ticket_row(ticket))
+            self.conn.executemany(
+                self._SQL_INSERT_TAG, [(ticket.id, tag) for tag in ticket.tags]
+            )
+            self._log_sla_event(ticket.id, "created", ticket.sla_hours)
         return ticket
 
-    def get_ticket(self, ticket_id: str) -> Optional[Ticket]:
-        row = self.conn.execute(
-            "SELECT * FROM tickets WHERE id=?", (ticket_id,)
-        ).fetchone()
-        return self._row_to_ticket(row) if row else None
+    def create_tickets(self, tickets: List[Ticket]) -> List[Ticket]:
+        """
+        Bulk-insert *tickets* and their 'created' SLA events in one
+        transaction.  Either all tickets are stored or none are.
+        """
+        now = _to_epoch(datetime.utcnow())
+        with self.conn:
+            self.conn.executemany(
+                self._SQL_INSERT_TICKET, [self._ticket_row(t) for t in tickets]
+            )
+            self.conn.executemany(
+                self._SQL_INSERT_TAG,
+                [(t.id, tag) for t in tickets for tag in t.tags],
+            )
+            self.conn.executemany(
+                self._SQL_INSERT_SLA_EVENT,
+                [(_new_id(), t.id, "created", now, t.sla_hours, 0)
+                 for t in tickets],
+            )
+        return tickets
 
-    def _row_to_ticket(self, row: sqlite3.Row) -> Ticket:
+    def get_ticket(self, ticket_id: str) -> Optional[Ticket]:
+        row = self.conn.execute(self._SQL_GET_TICKET, (ticket_id,)).fetchone()
+        if not row:
+            return None
+        return self._row_to_ticket(row, self.get_ticket_tags(ticket_id))
+
+    def get_ticket_tags(self, ticket_id: str) -> List[str]:
+        """Tags of one ticket, in the order they were added."""
+        return [r[0] for r in self.conn.execute(
+            "SELECT tag FROM ticket_tags WHERE ticket_id=? ORDER BY rowid",
+            (ticket_id,),
+        )]
+
+    def _attach_tags(self, tickets: List[Ticket]) -> List[Ticket]:
+        """Fill ``tags`` for many tickets with one query per chunk."""
+        by_id = {t.id: t for t in tickets}
+        ids = list(by_id)
+        for i in range(0, len(ids), _TAG_FETCH_CHUNK):
+            chunk = ids[i:i + _TAG_FETCH_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            for tid, tag in self.conn.execute(
+                f"SELECT ticket_id, tag FROM ticket_tags "
+                f"WHERE ticket_id IN ({marks}) ORDER BY rowid",
+                chunk,
+            ):
+                by_id[tid].tags.append(tag)
+        return tickets
+
+    @staticmethod
+    def _row_to_ticket(row: sqlite3.Row,
+                       tags: Optional[List[str]] = None) -> Ticket:
+        # Positional unpack; row must be selected with TICKET_COLUMNS.
+        (tid, title, description, requester, priority, status, assignee,
+         sla_hours, created_at, updated_at, resolved_at) = row
         return Ticket(
-            id=row["id"], title=row["title"], description=row["description"],
-            requester=row["requester"], priority=row["priority"],
-            status=row["status"], assignee=row["assignee"],
-            sla_hours=row["sla_hours"],
-            tags=[t for t in (row["tags"] or "").split(",") if t],
-            created_at=datetime.fromisoformat(row["created_at"]),
-            updated_at=datetime.fromisoformat(row["updated_at"]),
-            resolved_at=datetime.fromisoformat(row["resolved_at"])
-                        if row["resolved_at"] else None,
+            id=tid, title=title, description=description,
+            requester=requester, priority=priority,
+            status=status, assignee=assignee,
+            sla_hours=sla_hours,
+            tags=tags if tags is not None else [],
+            created_at=_from_epoch(created_at),
+            updated_at=_from_epoch(updated_at),
+            resolved_at=_from_epoch(resolved_at)
+                        if resolved_at is not None else None,
         )
 
     def assign_ticket(self, ticket_id: str, assignee: str) -> bool:
-        now = datetime.utcnow().isoformat()
-        cur = self.conn.execute(
-            "UPDATE tickets SET assignee=?, updated_at=?, status=? "
-            "WHERE id=? AND status='open'",
-            (assignee, now, "in_progress", ticket_id),
-        )
-        self.conn.commit()
+        now = _to_epoch(datetime.utcnow())
+        with self.conn:
+            cur = self.conn.execute(
+                "UPDATE tickets SET assignee=?, updated_at=?, status=? "
+                "WHERE id=? AND status='open'",
+                (assignee, now, "in_progress", ticket_id),
+            )
         return cur.rowcount > 0
 
     def update_status(self, ticket_id: str, status: str,
                       author: str = "system", note: str = "") -> bool:
-        ticket = self.get_ticket(ticket_id)
-        if not ticket:
-            return False
-        allowed = STATUS_FLOW.get(ticket.status, [])
-        if status not in allowed:
-            raise ValueError(
-                f"Invalid transition {ticket.status!r} → {status!r}. "
-                f"Allowed: {allowed}"
-            )
         now = datetime.utcnow()
-        resolved_at = now.isoformat() if status in ("resolved", "closed") else None
-        self.conn.execute(
-            "UPDATE tickets SET status=?, updated_at=?, resolved_at=? WHERE id=?",
-            (status, now.isoformat(), resolved_at, ticket_id),
-        )
-        self._log_sla_event(ticket_id, f"status→{status}", ticket.sla_hours,
-                            was_breached=ticket.is_breached())
-        if note:
-            self.add_comment(
-                Comment(ticket_id=ticket_id, author=author, body=note,
-                        is_internal=True)
+        now_ts = _to_epoch(now)
+        resolved_at = now_ts if status in _DONE else None
+        prev = REVERSE_FLOW.get(status, ())
+        marks = ",".join("?" * len(prev))
+        with self.conn:
+            # The SLA event is logged from the pre-update row, and its
+            # status filter doubles as the transition check, so no separate
+            # SELECT / Ticket round-trip is needed on the happy path.
+            cur = self.conn.execute(
+                "INSERT INTO sla_history "
+                f"SELECT ?, id, ?, ?, sla_hours, {_BREACHED_SQL} "
+                f"FROM tickets WHERE id=? AND status IN ({marks})",
+                (_new_id(), f"status→{status}", now_ts, now_ts, ticket_id, *prev),
             )
-        self.conn.commit()
+            if cur.rowcount == 0:
+                row = self.conn.execute(
+                    "SELECT status FROM tickets WHERE id=?", (ticket_id,)
+                ).fetchone()
+                if not row:
+                    return False
+                allowed = STATUS_FLOW.get(row["status"], [])
+                raise ValueError(
+                    f"Invalid transition {row['status']!r} → {status!r}. "
+                    f"Allowed: {allowed}"
+                )
+            self.conn.execute(
+                "UPDATE tickets SET status=?, updated_at=?, resolved_at=? WHERE id=?",
+                (status, now_ts, resolved_at, ticket_id),
+            )
+            if note:
+                self._insert_comment(
+                    Comment(ticket_id=ticket_id, author=author, body=note,
+                            is_internal=True, created_at=now)
+                )
         return True
 
     def escalate(self, ticket_id: str, reason: str = "") -> bool:
@@ -218,37 +588,41 @@ class TicketSystem:
             return False
         new_prio = max(1, row["priority"] - 1)
         new_sla = DEFAULT_SLA[new_prio]
-        self.conn.execute(
-            "UPDATE tickets SET priority=?, sla_hours=?, updated_at=? WHERE id=?",
-            (new_prio, new_sla, datetime.utcnow().isoformat(), ticket_id),
-        )
-        self._log_sla_event(ticket_id, "escalated", new_sla)
-        if reason:
-            self.add_comment(
-                Comment(ticket_id=ticket_id, author="system",
-                        body=f"Escalated: {reason}", is_internal=True)
+        with self.conn:
+            self.conn.execute(
+                "UPDATE tickets SET priority=?, sla_hours=?, updated_at=? WHERE id=?",
+                (new_prio, new_sla, _to_epoch(datetime.utcnow()), ticket_id),
             )
-        self.conn.commit()
+            self._log_sla_event(ticket_id, "escalated", new_sla)
+            if reason:
+                self._insert_comment(
+                    Comment(ticket_id=ticket_id, author="system",
+                            body=f"Escalated: {reason}", is_internal=True)
+                )
         return True
 
     # ── SLA ──────────────────────────────────────────────────────────────────
 
     def _log_sla_event(self, ticket_id: str, event: str,
                        sla_hours: Optional[int] = None,
-                       was_breached: bool = False) -> None:
+                       was_breached: bool = False,
+                       now: Optional[datetime] = None) -> None:
+        if now is None:
+            now = datetime.utcnow()
         self.conn.execute(
-            "INSERT INTO sla_history VALUES (?,?,?,?,?,?)",
-            (str(uuid.uuid4()), ticket_id, event,
-             datetime.utcnow().isoformat(), sla_hours, int(was_breached)),
+            self._SQL_INSERT_SLA_EVENT,
+            (_new_id(), ticket_id, event,
+             _to_epoch(now), sla_hours, int(was_breached)),
         )
 
     def check_sla_breach(self, ticket_id: str) -> Dict[str, Any]:
         ticket = self.get_ticket(ticket_id)
         if not ticket:
             raise ValueError(f"Ticket {ticket_id!r} not found")
+        now = datetime.utcnow()
         deadline = ticket.sla_deadline()
-        breached = ticket.is_breached()
-        remaining = ticket.time_to_sla()
+        breached = ticket.is_breached(now)
+        remaining = ticket.time_to_sla(now)
         return {
             "ticket_id": ticket_id,
             "priority": ticket.priority,
@@ -262,80 +636,107 @@ class TicketSystem:
 
     def get_breached_tickets(self) -> List[Dict[str, Any]]:
         """Return all open tickets that have breached their SLA."""
+        now = _to_epoch(datetime.utcnow())
         rows = self.conn.execute(
-            "SELECT * FROM tickets WHERE status NOT IN ('resolved','closed','cancelled')"
+            "SELECT id, title, priority, assignee, "
+            "       (? - created_at - sla_hours * 3600) / 3600.0 AS overdue_hours "
+            "FROM tickets "
+            f"WHERE {_OPEN_STATUS_SQL} "
+            "  AND ? > created_at + sla_hours * 3600 "
+            "ORDER BY overdue_hours DESC",
+            (now, now),
         ).fetchall()
-        result = []
-        for row in rows:
-            ticket = self._row_to_ticket(row)
-            if ticket.is_breached():
-                deadline = ticket.sla_deadline()
-                overdue_hrs = (datetime.utcnow() - deadline).total_seconds() / 3600
-                result.append({
-                    "ticket_id": ticket.id,
-                    "title": ticket.title,
-                    "priority": PRIORITY_LABELS[ticket.priority],
-                    "assignee": ticket.assignee,
-                    "overdue_hours": round(overdue_hrs, 1),
-                })
-        result.sort(key=lambda x: x["overdue_hours"], reverse=True)
-        return result
+        labels = PRIORITY_LABELS
+        return [
+            {
+                "ticket_id": tid,
+                "title": title,
+                "priority": labels[priority],
+                "assignee": assignee,
+                "overdue_hours": round(overdue, 1),
+            }
+            for tid, title, priority, assignee, overdue in rows
+        ]
 
     # ── auto-priority ─────────────────────────────────────────────────────────
 
     def auto_priority(self, description: str) -> Tuple[int, int]:
         """
         Infer ticket priority and SLA hours from description text using
-        keyword scoring.  Returns (priority, sla_hours).
+        keyword matching.  Returns (priority, sla_hours).
         """
-        text = description.lower()
-        scores: Dict[int, int] = defaultdict(int)
-        for priority, keywords in PRIORITY_KEYWORDS.items():
-            for kw in keywords:
-                if kw in text:
-                    scores[priority] += 1
-        if scores:
-            # Pick highest priority (lowest number) with score > 0
-            best_priority = min(p for p, s in scores.items() if s > 0)
-        else:
+        # Highest priority (lowest number) with any keyword hit
+        best_priority = _keyword_priority(description.lower())
+        if best_priority is None:
             best_priority = 3   # default: medium
         return best_priority, DEFAULT_SLA[best_priority]
 
+    def find_similar(self, text: str, limit: int = 5) -> List[Ticket]:
+        """
+        Return up to *limit* stored tickets whose title/description best
+        match any word of *text* (FTS5 bm25 ranking).  Empty when the
+        SQLite build lacks FTS5 or *text* has no searchable words.
+        """
+        words = re.findall(r"\w+", text.lower())
+        if not self.has_fts or not words:
+            return []
+        # Quote each word so user text cannot inject FTS query syntax.
+        query = " OR ".join(f'"{w}"' for w in dict.fromkeys(words))
+        columns = ", ".join("t." + c for c in TICKET_COLUMNS.split(", "))
+        rows = self.conn.execute(
+            f"SELECT {columns} FROM tickets_fts "
+            "JOIN tickets t ON t.rowid = tickets_fts.rowid "
+            "WHERE tickets_fts MATCH ? ORDER BY rank LIMIT ?",
+            (query, limit),
+        ).fetchall()
+        return self._attach_tags([self._row_to_ticket(r) for r in rows])
+
     # ── comments ─────────────────────────────────────────────────────────────
 
     def add_comment(self, comment: Comment) -> Comment:
+        with self.conn:
+            self._insert_comment(comment)
+        return comment
+
+    def _insert_comment(self, comment: Comment) -> None:
+        # Caller owns the transaction.
         self.conn.execute(
-            "INSERT INTO comments VALUES (?,?,?,?,?,?)",
+            self._SQL_INSERT_COMMENT,
             (comment.id, comment.ticket_id, comment.author, comment.body,
-             int(comment.is_internal), comment.created_at.isoformat()),
+             int(comment.is_internal), _to_epoch(comment.created_at)),
         )
         self.conn.execute(
-            "UPDATE tickets SET updated_at=? WHERE id=?",
-            (comment.created_at.isoformat(), comment.ticket_id),
+            self._SQL_TOUCH_TICKET,
+            (_to_epoch(comment.created_at), comment.ticket_id),
         )
-        self.conn.commit()
-        return comment
 
-    def get_comments(self, ticket_id: str,
-                     include_internal: bool = True) -> List[Comment]:
+    def iter_comments(self, ticket_id: str,
+                      include_internal: bool = True) -> Iterator[sqlite3.Row]:
+        """
+        Lazily yield raw comment rows (id, ticket_id, author, body,
+        is_internal, created_at) without building Comment objects.
+        ``created_at`` is epoch seconds and ``is_internal`` is 0/1.
+        """
         if include_internal:
-            rows = self.conn.execute(
-                "SELECT * FROM comments WHERE ticket_id=? ORDER BY created_at",
-                (ticket_id,),
-            ).fetchall()
-        else:
-            rows = self.conn.execute(
-                "SELECT * FROM comments WHERE ticket_id=? AND is_internal=0 "
-                "ORDER BY created_at",
+            return self.conn.execute(
+                "SELECT * FROM comments WHERE ticket_id=? ORDER BY created_at, rowid",
                 (ticket_id,),
-            ).fetchall()
+            )
+        return self.conn.execute(
+            "SELECT * FROM comments WHERE ticket_id=? AND is_internal=0 "
+            "ORDER BY created_at, rowid",
+            (ticket_id,),
+        )
+
+    def get_comments(self, ticket_id: str,
+                     include_internal: bool = True) -> List[Comment]:
         return [
             Comment(
                 id=r["id"], ticket_id=r["ticket_id"], author=r["author"],
                 body=r["body"], is_internal=bool(r["is_internal"]),
-                created_at=datetime.fromisoformat(r["created_at"]),
+                created_at=_from_epoch(r["created_at"]),
             )
-            for r in rows
+            for r in self.iter_comments(ticket_id, include_internal)
         ]
 
     # ── queue management ──────────────────────────────────────────────────────
@@ -345,11 +746,49 @@ class TicketSystem:
         assignee: Optional[str] = None,
         status: Optional[str] = None,
         priority: Optional[int] = None,
+        tag: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> List[Ticket]:
         """
         Return filtered, priority-sorted ticket queue.
         Unassigned tickets appear when assignee is omitted.
+        Pass *limit*/*offset* to fetch one page.
+        """
+        sql, params = self._queue_query(assignee, status, priority, tag,
+                                        limit, offset)
+        rows = self.conn.execute(sql, params).fetchall()
+        return self._attach_tags([self._row_to_ticket(r) for r in rows])
+
+    def iter_queue(
+        self,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[int] = None,
+        tag: Optional[str] = None,
+        batch_size: int = _TAG_FETCH_CHUNK,
+    ) -> Iterator[Ticket]:
         """
+        Lazily yield the same tickets as get_queue, reading *batch_size*
+        rows at a time so memory stays bounded for large queues.
+        """
+        sql, params = self._queue_query(assignee, status, priority, tag)
+        cur = self.conn.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from self._attach_tags([self._row_to_ticket(r) for r in rows])
+
+    @staticmethod
+    def _queue_query(
+        assignee: Optional[str],
+        status: Optional[str],
+        priority: Optional[int],
+        tag: Optional[str],
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Tuple[str, List[Any]]:
         clauses: List[str] = []
         params: List[Any] = []
         if assignee:
@@ -359,16 +798,20 @@ class TicketSystem:
             clauses.append("status=?")
             params.append(status)
         elif not assignee:
-            clauses.append("status NOT IN ('resolved','closed','cancelled')")
+            clauses.append(_OPEN_STATUS_SQL)
         if priority:
             clauses.append("priority=?")
             params.append(priority)
+        if tag:
+            clauses.append("id IN (SELECT ticket_id FROM ticket_tags WHERE tag=?)")
+            params.append(tag)
         where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
-        rows = self.conn.execute(
-            f"SELECT * FROM tickets {where} ORDER BY priority ASC, created_at ASC",
-            params,
-        ).fetchall()
-        return [self._row_to_ticket(r) for r in rows]
+        sql = (f"SELECT {TICKET_COLUMNS} FROM tickets {where} "
+               "ORDER BY priority ASC, created_at ASC")
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else limit, offset]
+        return sql, params
 
     # ── weekly report ─────────────────────────────────────────────────────────
 
@@ -378,63 +821,51 @@ class TicketSystem:
         Includes open/closed counts, avg resolution time,
         SLA breach rate, and per-priority breakdown.
         """
-        since = (datetime.utcnow() - timedelta(days=days)).isoformat()
-
-        total_opened = self.conn.execute(
-            "SELECT COUNT(*) FROM tickets WHERE created_at >= ?", (since,)
-        ).fetchone()[0]
-
-        total_resolved = self.conn.execute(
-            "SELECT COUNT(*) FROM tickets WHERE resolved_at >= ?", (since,)
-        ).fetchone()[0]
-
-        # Average resolution time in hours
-        rows = self.conn.execute(
-            "SELECT created_at, resolved_at FROM tickets "
-            "WHERE resolved_at >= ? AND status IN ('resolved','closed')",
-            (since,),
-        ).fetchall()
-        if rows:
-            res_times = [
-                (datetime.fromisoformat(r["resolved_at"]) -
-                 datetime.fromisoformat(r["created_at"])).total_seconds() / 3600
-                for r in rows
-            ]
-            avg_resolution_hrs = round(sum(res_times) / len(res_times), 1)
-        else:
-            avg_resolution_hrs = None
-
-        # SLA breach rate
-        all_resolved = self.conn.execute(
-            "SELECT COUNT(*) FROM sla_history "
-            "WHERE event LIKE 'status→%' AND occurred_at >= ?",
-            (since,),
-        ).fetchone()[0]
-        breached = self.conn.execute(
-            "SELECT COUNT(*) FROM sla_history "
-            "WHERE was_breached=1 AND occurred_at >= ?",
-            (since,),
-        ).fetchone()[0]
-        breach_rate = round(breached / all_resolved * 100, 1) if all_resolved else 0
+        since = _to_epoch(datetime.utcnow() - timedelta(days=days))
+
+        totals = self.conn.execute(
+            "WITH history AS ("
+            "    SELECT SUM(event LIKE 'status→%') AS transitions, "
+            "           SUM(was_breached) AS breached "
+            "    FROM sla_history WHERE occurred_at >= :since"
+            ") "
+            "SELECT "
+            "  (SELECT COUNT(*) FROM tickets WHERE created_at >= :since) AS opened, "
+            "  (SELECT COUNT(*) FROM tickets WHERE resolved_at >= :since) AS resolved, "
+            "  (SELECT AVG((resolved_at - created_at) / 3600.0) FROM tickets "
+            "   WHERE resolved_at >= :since "
+            f"     AND status IN {_DONE_SQL}) AS avg_hrs, "
+            "  (SELECT COUNT(*) FROM tickets "
+            f"   WHERE {_OPEN_STATUS_SQL}) AS still_open, "
+            "  CASE WHEN transitions > 0 "
+            "       THEN ROUND(breached * 100.0 / transitions, 1) ELSE 0 END "
+            "      AS breach_rate "
+            "FROM history",
+            {"since": since},
+        ).fetchone()
+        avg_resolution_hrs = (round(totals["avg_hrs"], 1)
+                              if totals["avg_hrs"] is not None else None)
 
         # Per-priority breakdown
         prio_rows = self.conn.execute(
             "SELECT priority, COUNT(*) as cnt, "
-            "       SUM(CASE WHEN status IN ('resolved','closed') THEN 1 ELSE 0 END) as done "
+            f"       SUM(CASE WHEN status IN {_DONE_SQL} THEN 1 ELSE 0 END) as done "
             "FROM tickets WHERE created_at >= ? GROUP BY priority",
             (since,),
         ).fetchall()
+        # Only stringify priorities that have no label (avoids the eager
+        # str() of a .get() default on every row).
         by_priority = {
-            PRIORITY_LABELS.get(r["priority"], str(r["priority"])): {
-                "opened": r["cnt"], "resolved": r["done"],
+            (PRIORITY_LABELS[p] if p in PRIORITY_LABELS else str(p)): {
+                "opened": cnt, "resolved": done,
             }
-            for r in prio_rows
+            for p, cnt, done in prio_rows
         }
 
         # Currently open by assignee
         assignee_rows = self.conn.execute(
             "SELECT assignee, COUNT(*) as cnt FROM tickets "
-            "WHERE status NOT IN ('resolved','closed','cancelled') "
+            f"WHERE {_OPEN_STATUS_SQL} "
             "GROUP BY assignee ORDER BY cnt DESC",
         ).fetchall()
         by_assignee = {
@@ -444,16 +875,13 @@ class TicketSystem:
         return {
             "report_days": days,
             "generated_at": datetime.utcnow().isoformat(),
-            "total_opened": total_opened,
-            "total_resolved": total_resolved,
+            "total_opened": totals["opened"],
+            "total_resolved": totals["resolved"],
             "avg_resolution_hours": avg_resolution_hrs,
-            "sla_breach_rate_pct": breach_rate,
+            "sla_breach_rate_pct": totals["breach_rate"],
             "by_priority": by_priority,
             "open_by_assignee": by_assignee,
-            "currently_open": self.conn.execute(
-                "SELECT COUNT(*) FROM tickets "
-                "WHERE status NOT IN ('resolved','closed','cancelled')"
-            ).fetchone()[0],
+            "currently_open": totals["still_open"],
         }
 
     def close(self) -> None:
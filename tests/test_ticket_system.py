@@ -1,6 +1,8 @@
 """Tests for BlackRoad Ticket System."""
+import sqlite3
 import pytest
 from datetime import datetime, timedelta
+import ticket_system
 from ticket_system import TicketSystem, Ticket, Comment, DEFAULT_SLA
 
 
@@ -118,3 +120,261 @@ def test_escalate(ts):
     assert fetched.sla_hours == DEFAULT_SLA[2]
     comments = ts.get_comments(t.id, include_internal=True)
     assert any("escalat" in c.body.lower() for c in comments)
+
+
+# ── test 10: breached-ticket listing ─────────────────────────────────────────
+def test_get_breached_tickets(ts):
+    old = Ticket(title="Old", description="x", requester="u", priority=2,
+                 sla_hours=1, created_at=datetime.utcnow() - timedelta(hours=5))
+    older = Ticket(title="Older", description="x", requester="u", priority=1,
+                   sla_hours=1, created_at=datetime.utcnow() - timedelta(hours=9))
+    fresh = Ticket(title="Fresh", description="x", requester="u", sla_hours=72)
+    for t in (old, older, fresh):
+        ts.create_ticket(t)
+    breached = ts.get_breached_tickets()
+    assert [b["title"] for b in breached] == ["Older", "Old"]
+    assert breached[0]["priority"] == "critical"
+    assert 7.5 < breached[0]["overdue_hours"] < 8.5
+
+
+# ── test 11: auto-priority picks most urgent keyword, defaults to medium ─────
+@pytest.fixture(params=["regex", "automaton"])
+def keyword_matcher(request, monkeypatch):
+    """Force _keyword_priority onto one matcher backend."""
+    if request.param == "regex":
+        monkeypatch.setattr(ticket_system, "_KEYWORD_AUTOMATON", None)
+    else:
+        module = pytest.importorskip("ahocorasick")
+        monkeypatch.setattr(ticket_system, "ahocorasick", module)
+        monkeypatch.setattr(ticket_system, "_KEYWORD_AUTOMATON",
+                            ticket_system._build_keyword_automaton())
+    return request.param
+
+
+def test_auto_priority_most_urgent_wins(ts, keyword_matcher):
+    assert ts.auto_priority("question about a slow crash")[0] == 1
+    assert ts.auto_priority("Minor BUG in a feature")[0] == 3
+    assert ts.auto_priority("nothing matches here") == (3, DEFAULT_SLA[3])
+    # overlapping keywords: "high" starts inside "crash"
+    assert ts.auto_priority("lowcrashigh")[0] == 1
+    assert ts.auto_priority("requestdata loss")[0] == 2
+
+
+# ── test 12: report totals and breach rate ───────────────────────────────────
+def test_generate_report_totals(ts):
+    late = Ticket(title="Late", description="x", requester="u", sla_hours=1,
+                  created_at=datetime.utcnow() - timedelta(hours=2))
+    on_time = Ticket(title="On time", description="x", requester="u")
+    idle = Ticket(title="Idle", description="x", requester="u")
+    for t in (late, on_time, idle):
+        ts.create_ticket(t)
+        ts.assign_ticket(t.id, "agent1")
+    for t in (late, on_time):
+        ts.update_status(t.id, "resolved")
+    report = ts.generate_report(days=7)
+    assert report["total_opened"] == 3
+    assert report["total_resolved"] == 2
+    assert report["currently_open"] == 1
+    assert report["sla_breach_rate_pct"] == 50.0
+    assert report["open_by_assignee"] == {"agent1": 1}
+    # late ticket: ~2h to resolve, on-time: ~0h
+    assert 0.9 <= report["avg_resolution_hours"] <= 1.1
+
+    empty = TicketSystem(":memory:")
+    assert empty.generate_report()["sla_breach_rate_pct"] == 0
+    assert empty.generate_report()["avg_resolution_hours"] is None
+    empty.close()
+
+
+# ── test 13: raw comment iteration ───────────────────────────────────────────
+def test_iter_comments(ts, open_ticket):
+    ts.add_comment(Comment(ticket_id=open_ticket.id, author="a", body="public"))
+    ts.add_comment(Comment(ticket_id=open_ticket.id, author="b", body="secret",
+                           is_internal=True))
+    rows = list(ts.iter_comments(open_ticket.id))
+    assert [r["body"] for r in rows] == ["public", "secret"]
+    assert isinstance(rows[0]["created_at"], int)
+    public = list(ts.iter_comments(open_ticket.id, include_internal=False))
+    assert [r["author"] for r in public] == ["a"]
+
+
+# ── test 14: bulk create is all-or-nothing ───────────────────────────────────
+def test_create_tickets(ts):
+    batch = [Ticket(title=f"Bulk {i}", description="d", requester="u")
+             for i in range(5)]
+    assert ts.create_tickets(batch) is batch
+    assert len(ts.get_queue()) == 5
+    assert ts.conn.execute(
+        "SELECT COUNT(*) FROM sla_history WHERE event='created'"
+    ).fetchone()[0] == 5
+
+    dup = [Ticket(title="New", description="d", requester="u"), batch[0]]
+    with pytest.raises(sqlite3.IntegrityError):
+        ts.create_tickets(dup)
+    assert ts.get_ticket(dup[0].id) is None
+
+
+# ── test 15: tags round-trip and tag-filtered queue ──────────────────────────
+def test_ticket_tags(ts):
+    t1 = Ticket(title="A", description="a", requester="u", tags=["vpn", "mac"])
+    t2 = Ticket(title="B", description="b", requester="u", tags=["vpn"])
+    t3 = Ticket(title="C", description="c", requester="u")
+    ts.create_ticket(t1)
+    ts.create_tickets([t2, t3])
+    assert ts.get_ticket(t1.id).tags == ["vpn", "mac"]
+    assert ts.get_ticket_tags(t3.id) == []
+    assert {t.title for t in ts.get_queue(tag="vpn")} == {"A", "B"}
+    assert [t.tags for t in ts.get_queue(tag="mac")] == [["vpn", "mac"]]
+
+
+# ── test 16: update_status edge cases and breach logging ─────────────────────
+def test_update_status_edge_cases(ts):
+    assert ts.update_status("missing", "in_progress") is False
+    t = Ticket(title="Late", description="x", requester="u", sla_hours=1,
+               created_at=datetime.utcnow() - timedelta(hours=2))
+    ts.create_ticket(t)
+    with pytest.raises(ValueError, match="Invalid transition"):
+        ts.update_status(t.id, "no_such_status")
+    assert ts.update_status(t.id, "in_progress", note="picked up")
+    assert ts.get_ticket(t.id).status == "in_progress"
+    assert ts.get_comments(t.id)[0].body == "picked up"
+    breached = ts.conn.execute(
+        "SELECT was_breached FROM sla_history WHERE event='status→in_progress'"
+    ).fetchone()[0]
+    assert breached == 1
+
+
+# ── test 17: queue paging and lazy iteration ─────────────────────────────────
+def test_queue_paging(ts):
+    base = datetime.utcnow() - timedelta(hours=1)
+    ts.create_tickets([
+        Ticket(title=f"T{i}", description="d", requester="u", tags=["x"],
+               created_at=base + timedelta(minutes=i))
+        for i in range(7)
+    ])
+    assert [t.title for t in ts.get_queue(limit=3)] == ["T0", "T1", "T2"]
+    assert [t.title for t in ts.get_queue(limit=3, offset=6)] == ["T6"]
+    assert len(ts.get_queue(offset=5)) == 2
+    lazy = list(ts.iter_queue(batch_size=2))
+    assert [t.title for t in lazy] == [f"T{i}" for i in range(7)]
+    assert all(t.tags == ["x"] for t in lazy)
+
+
+# ── test 18: full-text similar-ticket search ─────────────────────────────────
+def test_find_similar(ts):
+    if not ts.has_fts:
+        pytest.skip("SQLite built without FTS5")
+    vpn = Ticket(title="VPN drops", description="vpn disconnects hourly",
+                 requester="u")
+    printer = Ticket(title="Printer jam", description="tray 2 jams",
+                     requester="u")
+    ts.create_tickets([vpn, printer])
+    assert [t.id for t in ts.find_similar("my VPN keeps dropping")] == [vpn.id]
+    assert ts.find_similar('"unbalanced quote AND (') == []
+    assert ts.find_similar("") == []
+    ts.conn.execute("UPDATE tickets SET title='Scanner jam' WHERE id=?",
+                    (printer.id,))
+    assert [t.title for t in ts.find_similar("scanner")] == ["Scanner jam"]
+
+
+# ── test 19: v0 (ISO TEXT timestamp) databases are migrated on open ──────────
+V0_DDL = """
+CREATE TABLE tickets (
+    id TEXT PRIMARY KEY, title TEXT NOT NULL, description TEXT NOT NULL,
+    requester TEXT NOT NULL, priority INTEGER NOT NULL DEFAULT 3,
+    status TEXT NOT NULL DEFAULT 'open', assignee TEXT,
+    sla_hours INTEGER NOT NULL DEFAULT 72, tags TEXT DEFAULT '',
+    created_at TEXT NOT NULL, updated_at TEXT NOT NULL, resolved_at TEXT
+);
+CREATE TABLE comments (
+    id TEXT PRIMARY KEY, ticket_id TEXT NOT NULL REFERENCES tickets(id),
+    author TEXT NOT NULL, body TEXT NOT NULL,
+    is_internal INTEGER NOT NULL DEFAULT 0, created_at TEXT NOT NULL
+);
+CREATE TABLE sla_history (
+    id TEXT PRIMARY KEY, ticket_id TEXT NOT NULL REFERENCES tickets(id),
+    event TEXT NOT NULL, occurred_at TEXT NOT NULL, sla_hours INTEGER,
+    was_breached INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX idx_tickets_status   ON tickets(status);
+CREATE INDEX idx_tickets_assignee ON tickets(assignee);
+CREATE INDEX idx_tickets_priority ON tickets(priority);
+CREATE INDEX idx_comments_ticket  ON comments(ticket_id);
+"""
+
+
+def _make_v0_db(path, created, tags=""):
+    conn = sqlite3.connect(path)
+    conn.executescript(V0_DDL)
+    iso = created.isoformat()
+    conn.execute(
+        "INSERT INTO tickets VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+        ("t1", "Legacy", "old row", "u", 2, "open", None, 1, tags,
+         iso, iso, None),
+    )
+    conn.execute("INSERT INTO comments VALUES (?,?,?,?,?,?)",
+                 ("c1", "t1", "a", "hello", 0, iso))
+    conn.execute("INSERT INTO sla_history VALUES (?,?,?,?,?,?)",
+                 ("s1", "t1", "created", iso, 1, 0))
+    conn.commit()
+    conn.close()
+
+
+def test_migrates_v0_database(tmp_path):
+    path = str(tmp_path / "v0.db")
+    created = datetime.utcnow().replace(microsecond=0) - timedelta(hours=3)
+    _make_v0_db(path, created, tags="vpn,,mac,vpn")
+    ts = TicketSystem(path)
+    try:
+        assert ts.conn.execute("PRAGMA user_version").fetchone()[0] == 1
+        ticket = ts.get_queue()[0]
+        assert ticket.created_at == created
+        assert ticket.tags == ["vpn", "mac"]
+        assert ts.get_ticket("t1").tags == ["vpn", "mac"]
+        assert [t.id for t in ts.get_queue(tag="mac")] == ["t1"]
+        assert "tags" not in {r["name"] for r in
+                              ts.conn.execute("PRAGMA table_info(tickets)")}
+        assert ts.get_comments("t1")[0].created_at == created
+        breached = ts.get_breached_tickets()
+        assert 1.9 < breached[0]["overdue_hours"] < 2.1
+        assert ts.generate_report()["total_opened"] == 1
+        ts.create_ticket(Ticket(title="New", description="d", requester="u"))
+    finally:
+        ts.close()
+    reopened = TicketSystem(path)
+    assert len(reopened.get_queue()) == 2
+    reopened.close()
+
+
+def test_backfills_tags_on_epoch_database(tmp_path):
+    path = str(tmp_path / "tags.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(V0_DDL.replace("created_at TEXT", "created_at INTEGER")
+                             .replace("updated_at TEXT", "updated_at INTEGER")
+                             .replace("resolved_at TEXT", "resolved_at INTEGER"))
+    conn.execute("INSERT INTO tickets VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+                 ("t1", "T", "d", "u", 3, "open", None, 72, "db,slow",
+                  1_700_000_000, 1_700_000_000, None))
+    conn.commit()
+    conn.close()
+    ts = TicketSystem(path)
+    assert ts.get_ticket("t1").tags == ["db", "slow"]
+    ts.create_ticket(Ticket(title="New", description="d", requester="u"))
+    ts.close()
+
+
+# ── test 21: SQL breach flag agrees with Ticket.is_breached ──────────────────
+@pytest.mark.parametrize("age_hours, expected", [(3, True), (0, False)])
+def test_logged_breach_matches_is_breached(ts, age_hours, expected):
+    t = Ticket(title="T", description="d", requester="u", sla_hours=1,
+               created_at=datetime.utcnow() - timedelta(hours=age_hours))
+    ts.create_ticket(t)
+    ts.assign_ticket(t.id, "agent1")
+    ts.update_status(t.id, "resolved")
+    resolved = ts.get_ticket(t.id)
+    assert resolved.is_breached() is expected
+    ts.update_status(t.id, "closed")   # logged from a terminal-status row
+    flag = ts.conn.execute(
+        "SELECT was_breached FROM sla_history WHERE event='status→closed'"
+    ).fetchone()[0]
+    assert bool(flag) is expected